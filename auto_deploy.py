@@ -10,32 +10,38 @@ import sys
 import json
 import time
 from discover_rpi import RaspberryPiDiscovery
+from tracing import span, traced
 
 def run_command(command, description, capture_output=False):
     """Run a command with proper error handling"""
     print(f"🔄 {description}...")
-    try:
-        if capture_output:
-            result = subprocess.run(command, shell=True, capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"✅ {description} - Success")
-                return result.stdout
-            else:
-                print(f"❌ {description} - Failed")
-                print(f"Error: {result.stderr}")
-                return None
-        else:
-            result = subprocess.run(command, shell=True)
-            if result.returncode == 0:
-                print(f"✅ {description} - Success")
-                return True
+    with span(description, category="command", command=command) as s:
+        try:
+            if capture_output:
+                result = subprocess.run(command, shell=True, capture_output=True, text=True)
+                s.set("returncode", result.returncode)
+                if result.returncode == 0:
+                    print(f"✅ {description} - Success")
+                    return result.stdout
+                else:
+                    print(f"❌ {description} - Failed")
+                    print(f"Error: {result.stderr}")
+                    return None
             else:
-                print(f"❌ {description} - Failed")
-                return False
-    except Exception as e:
-        print(f"❌ {description} - Error: {e}")
-        return False
+                result = subprocess.run(command, shell=True)
+                s.set("returncode", result.returncode)
+                if result.returncode == 0:
+                    print(f"✅ {description} - Success")
+                    return True
+                else:
+                    print(f"❌ {description} - Failed")
+                    return False
+        except Exception as e:
+            s.set("error", str(e))
+            print(f"❌ {description} - Error: {e}")
+            return False
 
+@traced("deploy_to_rpi", category="deploy", record=("rpi_ip", "username"))
 def deploy_to_rpi(rpi_ip, username="srihari"):
     """Deploy built frontend to Raspberry Pi"""
     print(f"\n📡 DEPLOYING TO RASPBERRY PI ({rpi_ip})")
@@ -61,72 +67,23 @@ def deploy_to_rpi(rpi_ip, username="srihari"):
         print("❌ Failed to deploy to RPi")
         return False
 
+@traced("create_rpi_web_server", category="deploy", record=("rpi_ip", "username"))
 def create_rpi_web_server(rpi_ip, username="srihari"):
-    """Create a simple web server script on RPi to serve the frontend"""
-    web_server_script = '''#!/usr/bin/env python3
-"""
-Simple web server to serve the frontend on Raspberry Pi
-"""
-
-import http.server
-import socketserver
-import os
-import sys
-
-class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, directory="web/dist", **kwargs)
-    
-    def end_headers(self):
-        # Add CORS headers
-        self.send_header('Access-Control-Allow-Origin', '*')
-        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
-        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
-        super().end_headers()
-
-def main():
-    port = 8080
-    
-    # Change to autonomy_system directory
-    os.chdir(os.path.expanduser("~/autonomy_system"))
-    
-    if not os.path.exists("web/dist"):
-        print("❌ Frontend not found. Deploy first with deployment script.")
-        sys.exit(1)
-    
-    print(f"🌐 Starting web server on port {port}")
-    print(f"📁 Serving from: {os.getcwd()}/web/dist")
-    print(f"🔗 Access at: http://localhost:{port}")
-    
-    with socketserver.TCPServer(("", port), CustomHTTPRequestHandler) as httpd:
-        print(f"✅ Server running...")
-        try:
-            httpd.serve_forever()
-        except KeyboardInterrupt:
-            print("\\n🛑 Server stopped")
+    """Install the web server script on RPi to serve the frontend"""
+    # The server script ships alongside this one (see rpi_web_server.py)
+    script_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'rpi_web_server.py')
 
-if __name__ == "__main__":
-    main()
-'''
-    
-    # Write script to temp file and copy to RPi
-    with open('temp_web_server.py', 'w') as f:
-        f.write(web_server_script)
-    
-    scp_cmd = f"scp temp_web_server.py {username}@{rpi_ip}:~/autonomy_system/web_server.py"
+    scp_cmd = f'scp "{script_path}" {username}@{rpi_ip}:~/autonomy_system/web_server.py'
     if run_command(scp_cmd, "Installing web server on RPi"):
-        os.remove('temp_web_server.py')
-        
         # Make executable
         chmod_cmd = f'ssh {username}@{rpi_ip} "chmod +x ~/autonomy_system/web_server.py"'
         run_command(chmod_cmd, "Making web server executable")
         
         print(f"✅ Web server installed on RPi")
         print(f"💡 Start with: ssh {username}@{rpi_ip} 'cd ~/autonomy_system && python3 web_server.py'")
+        print(f"📊 Metrics: http://{rpi_ip}:8080/metrics")
         return True
     else:
-        if os.path.exists('temp_web_server.py'):
-            os.remove('temp_web_server.py')
         return False
 
 def main():
@@ -141,17 +98,21 @@ def main():
     
     # Try existing config first
     rpi_ip = None
-    try:
-        with open('rpi_config.json', 'r') as f:
-            config = json.load(f)
-        if discovery.check_rpi_api(config['rpi_ip']):
-            rpi_ip = config['rpi_ip']
-            print(f"✅ Using cached IP: {rpi_ip}")
-    except:
-        pass
-    
-    if not rpi_ip:
-        rpi_ip = discovery.discover_raspberry_pi()
+    with span("Step 1: discover Raspberry Pi", category="deploy") as step:
+        try:
+            with open('rpi_config.json', 'r') as f:
+                config = json.load(f)
+            with span("check_rpi_api cached IP", category="discovery", ip=config['rpi_ip']):
+                cached_ok = discovery.check_rpi_api(config['rpi_ip'])
+            if cached_ok:
+                rpi_ip = config['rpi_ip']
+                print(f"✅ Using cached IP: {rpi_ip}")
+        except:
+            pass
+        
+        if not rpi_ip:
+            rpi_ip = discovery.discover_raspberry_pi()
+        step.set("rpi_ip", rpi_ip)
     
     if not rpi_ip:
         print("❌ Cannot proceed without Raspberry Pi")
@@ -159,9 +120,10 @@ def main():
         return False
     
     # Update configurations
-    discovery.update_environment_files(rpi_ip)
-    discovery.update_github_workflow(rpi_ip)
-    discovery.save_config(rpi_ip)
+    with span("Update configuration files", category="deploy", rpi_ip=rpi_ip):
+        discovery.update_environment_files(rpi_ip)
+        discovery.update_github_workflow(rpi_ip)
+        discovery.save_config(rpi_ip)
     
     # Step 2: Install dependencies
     print("\n📦 STEP 2: INSTALLING DEPENDENCIES")
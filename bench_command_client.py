@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Command Client Benchmark
+Measures p99 command latency of RobotCommandClient against a local mock
+backend while other threads hammer /api/system_status with telemetry polls,
+then queues a navigation backlog and times an emergency stop through it.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from command_client import RobotCommandClient
+
+
+class MockBackendHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    service_delay = 0.0
+    # Paths of POSTs in arrival order
+    received = []
+
+    def _reply(self, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        time.sleep(self.service_delay)
+        self._reply({"system_status": "running", "cpu_usage": 12.5})
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length", 0))
+        self.rfile.read(length)
+        self.received.append(self.path)
+        time.sleep(self.service_delay)
+        self._reply({"status": "ok"})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def telemetry_load(port, stop_event, counter):
+    """Poll /api/system_status as fast as possible on a private connection"""
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    while not stop_event.is_set():
+        try:
+            conn.request("GET", "/api/system_status")
+            conn.getresponse().read()
+            counter[0] += 1
+        except (http.client.HTTPException, OSError):
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the robot command client")
+    parser.add_argument("--commands", type=int, default=2000, help="navigation commands to send")
+    parser.add_argument("--telemetry-threads", type=int, default=8, help="concurrent telemetry pollers")
+    parser.add_argument("--service-delay-ms", type=float, default=0.0, help="mock backend processing time")
+    parser.add_argument("--backlog", type=int, default=200, help="navigation commands queued ahead of the e-stop")
+    parser.add_argument("--backlog-delay-ms", type=float, default=5.0,
+                        help="mock processing time while the backlog is queued")
+    args = parser.parse_args()
+
+    MockBackendHandler.service_delay = args.service_delay_ms / 1000
+    server = ThreadingHTTPServer(("127.0.0.1", 0), MockBackendHandler)
+    server.daemon_threads = True
+    port = server.server_address[1]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    print("🚀 Command Client Benchmark")
+    print("=" * 50)
+    print(f"🔌 Mock backend on 127.0.0.1:{port}")
+    print(f"📡 Telemetry pollers: {args.telemetry_threads}")
+
+    stop_event = threading.Event()
+    counters = [[0] for _ in range(args.telemetry_threads)]
+    pollers = [
+        threading.Thread(target=telemetry_load, args=(port, stop_event, counter), daemon=True)
+        for counter in counters
+    ]
+    for poller in pollers:
+        poller.start()
+
+    client = RobotCommandClient("127.0.0.1", port, latency_window=args.commands + 1)
+    client.start()
+
+    start = time.perf_counter()
+    for i in range(args.commands):
+        # Distinct names so every command is sent rather than coalesced
+        client.send_navigation(f"move_{i}", {"speed": 0.5}).result()
+    elapsed = time.perf_counter() - start
+    stats = client.latency_stats()
+
+    # Queue a backlog without waiting, repeat the last command so it
+    # coalesces, then stop: the e-stop must not wait behind the backlog
+    MockBackendHandler.service_delay = args.backlog_delay_ms / 1000
+    first_post = len(MockBackendHandler.received)
+    backlog = [client.send_navigation(f"waypoint_{i}", {"speed": 0.5}) for i in range(args.backlog)]
+    for speed in (0.6, 0.7, 0.8):
+        client.send_navigation(f"waypoint_{args.backlog - 1}", {"speed": speed})
+    stop_latency_start = time.perf_counter()
+    stopped = client.emergency_stop().result()
+    stop_latency = time.perf_counter() - stop_latency_start
+
+    posts = MockBackendHandler.received[first_post:]
+    nav_before_stop = posts.index("/api/emergency_stop") if "/api/emergency_stop" in posts else len(posts)
+    nav_after_stop = posts[nav_before_stop + 1:].count("/api/navigation")
+    dropped = sum(1 for future in backlog if not future.result())
+    fifo_estimate = (args.backlog - nav_before_stop) * args.backlog_delay_ms
+
+    client.close()
+    stop_event.set()
+    for poller in pollers:
+        poller.join(timeout=5)
+    server.shutdown()
+
+    telemetry_total = sum(counter[0] for counter in counters)
+
+    print("\n" + "=" * 50)
+    print(f"📊 Commands sent: {stats['count']} in {elapsed:.2f}s")
+    print(f"📡 Telemetry requests served: {telemetry_total} ({telemetry_total / elapsed:.0f}/s)")
+    print(f"⏱️  p50: {stats['p50_ms']:.2f} ms")
+    print(f"⏱️  p99: {stats['p99_ms']:.2f} ms")
+    print(f"⏱️  max: {stats['max_ms']:.2f} ms")
+
+    print(f"\n🛑 Emergency stop behind {args.backlog} queued commands: {'ok' if stopped else 'FAILED'}")
+    print(f"⏱️  E-stop latency: {stop_latency * 1000:.2f} ms "
+          f"(FIFO would wait ~{fifo_estimate:.0f} ms more)")
+    print(f"📊 Navigation sent before / after e-stop: {nav_before_stop} / {nav_after_stop}")
+    print(f"📊 Dropped: {dropped}, coalesced: {client.coalesced_count}")
+
+
+if __name__ == "__main__":
+    main()
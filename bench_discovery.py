@@ -0,0 +1,382 @@
+#!/usr/bin/env python3
+"""
+Discovery Benchmark with an emulated yard network
+Brings up thousands of fake hosts on loopback (127.0.0.0/8 is local on Linux;
+on macOS add lo0 aliases first), a few of which answer /api/system_status,
+then times RaspberryPiDiscovery end to end and compares against a saved
+baseline.
+
+ICMP cannot be shaped on loopback without root, so the ping stage is modelled
+in-process with the same RTT/loss per host; the `ping` processes the real
+engine would spawn are therefore not measured. Only the responders and decoys
+(23 hosts by default) get real sockets: the API stage is real HTTP against
+asyncio responders running in a separate process, so file descriptors and
+threads counted here belong to the discovery engine only. API probes of every
+other host are modelled too: a host that is up refuses the connection after
+one RTT (plus a SYN retransmit if the probe is lost), a host that is down
+lets the request time out.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import ipaddress
+import json
+import multiprocessing
+import os
+import random
+import threading
+import time
+
+from discover_rpi import MIN_SCAN_PREFIX, RaspberryPiDiscovery
+
+BASELINE_FILE = "bench_discovery_baseline.json"
+# Metrics compared against the baseline, all "lower is better", with the
+# absolute slack allowed on top of the relative tolerance. Counts are small
+# and jump by whole units, a relative tolerance alone would flag noise.
+TRACKED_METRICS = {
+    "time_to_first_hit_s": 0.0,
+    "total_scan_s": 0.0,
+    "peak_open_fds": 4,
+    "peak_threads": 2,
+}
+# requests timeout used by RaspberryPiDiscovery.check_rpi_api
+API_TIMEOUT = 3.0
+# Linux retransmits an unanswered SYN after one second
+SYN_RETRY = 1.0
+
+
+class FakeHost:
+    __slots__ = ("ip", "up", "rtt", "kind")
+
+    def __init__(self, ip, up, rtt, kind):
+        self.ip = ip
+        self.up = up
+        self.rtt = rtt
+        # None, "rpi" (our API) or "decoy" (some other HTTP server)
+        self.kind = kind
+
+
+class FakeNetwork:
+    def __init__(self, network, up_fraction=0.3, responders=3, decoys=20,
+                 rtt_ms=5.0, jitter_ms=2.0, loss=0.02, api_port=5000,
+                 ping_timeout=1.0, seed=1):
+        self.network = network
+        self.loss = loss
+        self.api_port = api_port
+        self.ping_timeout = ping_timeout
+        self.seed = seed
+        self._rng = random.Random(seed)
+        self._rng_lock = threading.Lock()
+        self._process = None
+        self._conn = None
+
+        self.hosts = {}
+        for ip in ipaddress.ip_network(network, strict=False).hosts():
+            rtt = max(0.0, self._rng.gauss(rtt_ms, jitter_ms)) / 1000
+            self.hosts[str(ip)] = FakeHost(str(ip), self._rng.random() < up_fraction, rtt, None)
+
+        up_hosts = [host for host in self.hosts.values() if host.up]
+        chosen = self._rng.sample(up_hosts, min(len(up_hosts), responders + decoys))
+        for i, host in enumerate(chosen):
+            host.kind = "rpi" if i < responders else "decoy"
+        self.responders = sorted(host.ip for host in chosen[:responders])
+
+    def _lost(self):
+        with self._rng_lock:
+            return self._rng.random() < self.loss
+
+    def ping(self, ip):
+        """Model of `ping -c 1 -W 1`: replies after one RTT or times out"""
+        host = self.hosts.get(ip)
+        if host is None or not host.up or self._lost():
+            time.sleep(self.ping_timeout)
+            return None
+        time.sleep(host.rtt)
+        return ip
+
+    def refuse(self, ip):
+        """Model of an API probe to a host without a listener.
+
+        Returns False for hosts that have a real responder, otherwise waits
+        for the refusal (or the client timeout if the host is down) and
+        returns True.
+        """
+        host = self.hosts.get(ip)
+        if host is not None and host.kind:
+            return False
+        if host is None or not host.up:
+            time.sleep(API_TIMEOUT)
+        elif self._lost():
+            time.sleep(SYN_RETRY + host.rtt)
+        else:
+            time.sleep(host.rtt)
+        return True
+
+    def start(self):
+        """Start the HTTP responders in a child process"""
+        servers = [(host.ip, host.rtt, host.kind) for host in self.hosts.values() if host.kind]
+        self._conn, child_conn = multiprocessing.Pipe()
+        self._process = multiprocessing.Process(
+            target=_run_responders,
+            args=(servers, self.api_port, self.loss, self.seed, child_conn),
+            daemon=True,
+        )
+        self._process.start()
+        status = self._conn.recv()
+        if status != "ready":
+            self.stop()
+            raise RuntimeError(f"Fake network failed to start: {status}")
+
+    def stop(self):
+        """Stop the responders, returns the number of connections they accepted"""
+        accepted = 0
+        if self._process is not None:
+            if self._process.is_alive():
+                self._conn.send("stop")
+                if self._conn.poll(5):
+                    accepted = self._conn.recv()
+            self._process.join(timeout=5)
+            self._process = None
+        return accepted
+
+
+def _run_responders(servers, api_port, loss, seed, conn):
+    asyncio.run(_serve_responders(servers, api_port, loss, seed, conn))
+
+
+async def _serve_responders(servers, api_port, loss, seed, conn):
+    rng = random.Random(seed)
+    accepted = [0]
+
+    def make_handler(rtt, kind):
+        async def handle(reader, writer):
+            accepted[0] += 1
+            try:
+                await reader.readuntil(b"\r\n\r\n")
+                if rng.random() < loss:
+                    # Lost: never answer, the client has to time out
+                    await asyncio.sleep(10)
+                    return
+                await asyncio.sleep(rtt)
+                if kind == "rpi":
+                    body = json.dumps({"system_status": "running", "cpu_usage": 23.5}).encode()
+                    status = b"200 OK"
+                else:
+                    body = b"Not Found"
+                    status = b"404 Not Found"
+                writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Type: application/json\r\n"
+                             b"Content-Length: " + str(len(body)).encode() +
+                             b"\r\nConnection: close\r\n\r\n" + body)
+                await writer.drain()
+            except (asyncio.IncompleteReadError, ConnectionError, asyncio.CancelledError):
+                # Client gave up, or lost probes still pending at shutdown
+                pass
+            finally:
+                writer.close()
+        return handle
+
+    try:
+        listeners = [
+            await asyncio.start_server(make_handler(rtt, kind), ip, api_port)
+            for ip, rtt, kind in servers
+        ]
+    except OSError as e:
+        conn.send(f"{e}")
+        return
+    conn.send("ready")
+
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, conn.recv)
+    for listener in listeners:
+        listener.close()
+    conn.send(accepted[0])
+
+
+class EmulatedDiscovery(RaspberryPiDiscovery):
+    """Real discovery engine with the ping stage routed to the fake network"""
+
+    def __init__(self, fake_network):
+        super().__init__(network=fake_network.network, api_port=fake_network.api_port)
+        self.fake_network = fake_network
+        self.first_hit_time = None
+        self.ping_probes = 0
+        self.api_probes = 0
+        self._count_lock = threading.Lock()
+
+    def ping_host(self, ip):
+        with self._count_lock:
+            self.ping_probes += 1
+        return self.fake_network.ping(ip)
+
+    def check_rpi_api(self, ip):
+        with self._count_lock:
+            self.api_probes += 1
+        if self.fake_network.refuse(ip):
+            return None
+        result = super().check_rpi_api(ip)
+        if result and self.first_hit_time is None:
+            self.first_hit_time = time.perf_counter()
+        return result
+
+
+class ResourceMonitor:
+    """Samples peak open fds and threads of this process"""
+
+    def __init__(self, interval=0.01):
+        self.interval = interval
+        self.peak_open_fds = 0
+        self.peak_threads = 0
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _sample(self):
+        try:
+            self.peak_open_fds = max(self.peak_open_fds, len(os.listdir("/proc/self/fd")))
+        except OSError:
+            # Not Linux
+            pass
+        # The monitor thread itself is not part of the engine
+        self.peak_threads = max(self.peak_threads, threading.active_count() - 1)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+        self._sample()
+
+
+def run_benchmark(args):
+    fake_network = FakeNetwork(
+        args.network, up_fraction=args.up, responders=args.responders, decoys=args.decoys,
+        rtt_ms=args.rtt_ms, jitter_ms=args.jitter_ms, loss=args.loss, api_port=args.port,
+        ping_timeout=args.ping_timeout, seed=args.seed,
+    )
+    fake_network.start()
+    try:
+        discovery = EmulatedDiscovery(fake_network)
+        quiet = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+        with ResourceMonitor() as monitor, quiet:
+            start = time.perf_counter()
+            found = discovery.discover_raspberry_pi()
+            total = time.perf_counter() - start
+    finally:
+        accepted = fake_network.stop()
+
+    return {
+        "hosts": len(fake_network.hosts),
+        "responders": fake_network.responders,
+        "found": found,
+        "correct": found in fake_network.responders,
+        "time_to_first_hit_s": (discovery.first_hit_time - start) if discovery.first_hit_time else None,
+        "total_scan_s": total,
+        # Modelled in-process, the real engine spawns one `ping` per probe
+        "ping_probes_modelled": discovery.ping_probes,
+        "api_probes": discovery.api_probes,
+        "api_connections_accepted": accepted,
+        "peak_open_fds": monitor.peak_open_fds,
+        "peak_threads": monitor.peak_threads,
+    }
+
+
+def scenario_name(args):
+    return (f"{args.network} up={args.up} rpi={args.responders} decoys={args.decoys} "
+            f"rtt={args.rtt_ms}±{args.jitter_ms}ms loss={args.loss} ping_timeout={args.ping_timeout}s "
+            f"seed={args.seed}")
+
+
+def compare_with_baseline(result, baseline, tolerance):
+    """Returns a list of (metric, baseline, current) that got worse"""
+    regressions = []
+    for metric, slack in TRACKED_METRICS.items():
+        old, new = baseline.get(metric), result.get(metric)
+        if old is None or new is None:
+            continue
+        if new > old * (1 + tolerance) + slack:
+            regressions.append((metric, old, new))
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark Raspberry Pi discovery against an emulated network")
+    parser.add_argument("--network", default="127.20.0.0/21", help="loopback CIDR to emulate")
+    parser.add_argument("--up", type=float, default=0.3, help="fraction of hosts that answer ping")
+    parser.add_argument("--responders", type=int, default=3, help="hosts serving /api/system_status")
+    parser.add_argument("--decoys", type=int, default=20, help="hosts serving some other HTTP app")
+    parser.add_argument("--rtt-ms", type=float, default=5.0, help="mean round-trip time")
+    parser.add_argument("--jitter-ms", type=float, default=2.0, help="RTT standard deviation")
+    parser.add_argument("--loss", type=float, default=0.02, help="probability a probe is lost")
+    parser.add_argument("--ping-timeout", type=float, default=1.0, help="seconds before an unanswered ping gives up")
+    parser.add_argument("--port", type=int, default=5000, help="API port of the fake hosts")
+    parser.add_argument("--seed", type=int, default=1, help="random seed for the host layout")
+    parser.add_argument("--baseline", default=BASELINE_FILE, help="baseline file")
+    parser.add_argument("--save-baseline", action="store_true", help="store this run as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed slowdown before flagging a regression")
+    parser.add_argument("--verbose", action="store_true", help="show discovery output")
+    args = parser.parse_args()
+
+    ip = ipaddress.ip_network(args.network, strict=False)
+    if not ip.is_loopback:
+        parser.error("--network must be inside 127.0.0.0/8")
+    if ip.prefixlen < MIN_SCAN_PREFIX:
+        parser.error(f"--network must be /{MIN_SCAN_PREFIX} or smaller, discovery refuses larger ranges")
+
+    print("🚀 Discovery Benchmark")
+    print("=" * 50)
+    name = scenario_name(args)
+    print(f"🧪 Scenario: {name}")
+
+    result = run_benchmark(args)
+
+    print(f"📡 Hosts emulated: {result['hosts']} ({len(result['responders'])} with autonomy API)")
+    if result["correct"]:
+        print(f"🎯 Found: {result['found']}")
+    else:
+        print(f"❌ Found: {result['found']} (expected one of {', '.join(result['responders'])})")
+    first_hit = result["time_to_first_hit_s"]
+    print(f"⏱️  Time to first hit: {first_hit:.2f}s" if first_hit is not None else "⏱️  Time to first hit: -")
+    print(f"⏱️  Total scan time: {result['total_scan_s']:.2f}s")
+    print(f"🔌 Ping probes: {result['ping_probes_modelled']} (modelled, the real engine spawns one ping each)")
+    print(f"🔌 API probes: {result['api_probes']}, connections accepted: {result['api_connections_accepted']}")
+    print(f"📊 Peak open fds: {result['peak_open_fds']}, threads: {result['peak_threads']}")
+
+    baselines = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, 'r') as f:
+            baselines = json.load(f)
+
+    exit_code = 0 if result["correct"] else 1
+    if name in baselines:
+        regressions = compare_with_baseline(result, baselines[name], args.tolerance)
+        if regressions:
+            exit_code = 1
+            slack = ", ".join(f"{metric} +{value}" for metric, value in TRACKED_METRICS.items() if value)
+            print(f"\n⚠️  Regressions vs baseline (>{args.tolerance:.0%}, {slack}):")
+            for metric, old, new in regressions:
+                print(f"   {metric}: {old:.2f} -> {new:.2f}")
+        else:
+            print(f"\n✅ Within {args.tolerance:.0%} of baseline")
+    elif not args.save_baseline:
+        print("\n💡 No baseline for this scenario yet, run with --save-baseline")
+
+    if args.save_baseline:
+        result["saved_at"] = time.time()
+        baselines[name] = result
+        with open(args.baseline, 'w') as f:
+            json.dump(baselines, f, indent=2)
+        print(f"💾 Baseline saved to {args.baseline}")
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
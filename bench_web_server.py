@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Web Server Instrumentation Benchmark
+Compares the RPi web server with and without /metrics instrumentation,
+serving a small fake dist/ directory: loopback throughput, plus the handler
+cost per request measured in-process, which is far less noisy.
+"""
+
+import argparse
+import http.client
+import http.server
+import io
+import os
+import socketserver
+import statistics
+import tempfile
+import threading
+import time
+
+from rpi_web_server import CustomHTTPRequestHandler, RouteMetrics
+
+ASSETS = {
+    "index.html": b"<!doctype html><html><body><div id=root></div></body></html>",
+    "assets/index.js": b"x" * 64 * 1024,
+    "assets/index.css": b"y" * 8 * 1024,
+}
+
+
+def make_dist(root):
+    for name, content in ASSETS.items():
+        path = os.path.join(root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(content)
+
+
+class PlainHandler(http.server.SimpleHTTPRequestHandler):
+    """The server as it was before instrumentation: CORS headers only"""
+    serve_directory = None
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=self.serve_directory, **kwargs)
+
+    def end_headers(self):
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        super().end_headers()
+
+
+def make_handler(directory, metrics):
+    """Handler instrumented with metrics, or PlainHandler if metrics is None"""
+    attrs = {"serve_directory": directory, "log_message": lambda self, *args: None}
+    if metrics is None:
+        return type("BenchPlainHandler", (PlainHandler,), attrs)
+    return type("BenchHandler", (CustomHTTPRequestHandler,), dict(attrs, metrics=metrics))
+
+
+def start_server(directory, metrics):
+    server = socketserver.TCPServer(("127.0.0.1", 0), make_handler(directory, metrics))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_round(port, requests_count):
+    """Fetch the assets in turn, returns requests per second"""
+    paths = ["/" + name for name in ASSETS]
+    start = time.perf_counter()
+    for i in range(requests_count):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+        conn.request("GET", paths[i % len(paths)])
+        conn.getresponse().read()
+        conn.close()
+    return requests_count / (time.perf_counter() - start)
+
+
+class FakeConnection:
+    """Just enough of a socket to run a handler without the network"""
+
+    def __init__(self, request):
+        self.request = request
+
+    def makefile(self, mode, *args, **kwargs):
+        return io.BytesIO(self.request)
+
+    def sendall(self, data):
+        pass
+
+
+def bench_handlers(plain_handler, instrumented_handler, iterations):
+    """Per-request handler time of both handlers, measured in pairs.
+
+    Each request is served by both handlers back to back, alternating which
+    goes first, so both see the same machine state. Returns the median plain
+    time and the median per-pair difference, in seconds.
+    """
+    requests = [f"GET /{name} HTTP/1.0\r\n\r\n".encode() for name in ASSETS]
+    client = ("127.0.0.1", 0)
+    plain_times, differences = [], []
+    for i in range(iterations):
+        request = requests[i % len(requests)]
+        order = (plain_handler, instrumented_handler) if i % 2 else (instrumented_handler, plain_handler)
+        times = {}
+        for handler in order:
+            start = time.perf_counter()
+            handler(FakeConnection(request), client, None)
+            times[handler] = time.perf_counter() - start
+        plain_times.append(times[plain_handler])
+        differences.append(times[instrumented_handler] - times[plain_handler])
+    return statistics.median(plain_times), statistics.median(differences)
+
+
+def bench_record(iterations):
+    """Cost of a single RouteMetrics.record call in nanoseconds"""
+    metrics = RouteMetrics()
+    routes = ["/" + name for name in ASSETS]
+    start = time.perf_counter()
+    for i in range(iterations):
+        metrics.record(routes[i % 3], 1024, 0.0012)
+    return (time.perf_counter() - start) / iterations * 1e9
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark web server instrumentation overhead")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per round")
+    parser.add_argument("--rounds", type=int, default=5, help="alternating rounds per server")
+    parser.add_argument("--handler-requests", type=int, default=10000, help="paired in-process requests")
+    args = parser.parse_args()
+
+    print("🚀 Web Server Instrumentation Benchmark")
+    print("=" * 50)
+
+    with tempfile.TemporaryDirectory() as root:
+        make_dist(root)
+        plain = start_server(root, None)
+        instrumented = start_server(root, RouteMetrics())
+
+        # Warm up both servers before measuring
+        run_round(plain.server_address[1], 200)
+        run_round(instrumented.server_address[1], 200)
+
+        plain_rates, instrumented_rates = [], []
+        for _ in range(args.rounds):
+            plain_rates.append(run_round(plain.server_address[1], args.requests))
+            instrumented_rates.append(run_round(instrumented.server_address[1], args.requests))
+
+        plain.shutdown()
+        instrumented.shutdown()
+        plain.server_close()
+        instrumented.server_close()
+
+        plain_time, extra_time = bench_handlers(
+            make_handler(root, None), make_handler(root, RouteMetrics()), args.handler_requests)
+
+    plain_rate = statistics.median(plain_rates)
+    instrumented_rate = statistics.median(instrumented_rates)
+    overhead = (plain_rate - instrumented_rate) / plain_rate * 100
+    handler_overhead = extra_time / plain_time * 100
+    record_ns = bench_record(200000)
+
+    print(f"📊 Without metrics: {plain_rate:.0f} req/s (median of {args.rounds})")
+    print(f"📊 With metrics:    {instrumented_rate:.0f} req/s (median of {args.rounds})")
+    print(f"⏱️  Loopback throughput overhead: {overhead:.2f}% (noisy)")
+    print(f"⏱️  Handler time: {plain_time * 1e6:.1f} us + {extra_time * 1e6:.1f} us per request "
+          f"({handler_overhead:.2f}% overhead, median of {args.handler_requests} pairs)")
+    print(f"⏱️  RouteMetrics.record: {record_ns:.0f} ns/call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Robot Command Client
+Low-latency client for /api/navigation and /api/emergency_stop.
+Keeps a warm connection to the RPi, lets emergency stops jump the queue
+and coalesces redundant movement commands.
+"""
+
+import http.client
+import heapq
+import itertools
+import json
+import socket
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+
+# Configuration
+RPI_IP = "192.168.0.101"
+RPI_PORT = 5000
+
+# Lower value = sent first
+PRIORITY_EMERGENCY = 0
+PRIORITY_NAVIGATION = 1
+
+
+class RobotCommandClient:
+    def __init__(self, host=RPI_IP, port=RPI_PORT, timeout=2.0, latency_window=1000,
+                 keepalive_idle=4.0):
+        self.host = host
+        self.port = int(port)
+        self.timeout = timeout
+        # Reconnect before sending once the connection sat idle this long,
+        # keep it below the backend's keep-alive timeout
+        self.keepalive_idle = keepalive_idle
+        self.latencies = deque(maxlen=latency_window)
+        self.coalesced_count = 0
+        self.dropped_count = 0
+
+        # Only touched by the dispatch thread
+        self._conn = None
+        self._last_used = 0.0
+
+        self._queue = []
+        self._nav_tail = None
+        # Bumped by emergency_stop(), older navigation entries are dropped
+        self._epoch = 0
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._running = False
+        self._worker = None
+
+    def start(self):
+        """Start the dispatch thread, which opens the connection"""
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._worker = threading.Thread(target=self._dispatch_loop, name="robot-commands", daemon=True)
+        self._worker.start()
+        return self
+
+    def close(self):
+        """Stop the dispatch thread.
+
+        Commands not sent yet resolve to False; a command already in flight
+        finishes, and the dispatch thread closes the connection on its way out.
+        """
+        with self._cond:
+            self._running = False
+            queued, self._queue = self._queue, []
+            self._nav_tail = None
+            self.dropped_count += len(queued)
+            self._cond.notify_all()
+        for entry in queued:
+            _resolve(entry[3]["future"], False)
+        if self._worker:
+            self._worker.join(timeout=self.timeout + 1)
+            self._worker = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _connect(self):
+        """Open a persistent HTTP/1.1 connection with Nagle disabled"""
+        self._conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        self._conn.connect()
+        self._conn.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+    def _disconnect(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+    def send_navigation(self, command, params=None):
+        """Queue a navigation command, returns a Future resolving to True/False.
+
+        If the most recently queued command has the same name and has not
+        been sent yet, it is updated with the new parameters instead, and
+        both callers get the same result. Commands are never merged across
+        a different command, so the order of movements is kept.
+        """
+        body = {"command": command, "parameters": params or {}}
+        with self._cond:
+            self._check_running()
+            tail = self._nav_tail
+            if tail is not None and tail[3]["command"] == command and not tail[3]["future"].done():
+                tail[3]["body"] = body
+                self.coalesced_count += 1
+                return tail[3]["future"]
+
+            future = Future()
+            entry = [PRIORITY_NAVIGATION, next(self._seq), "/api/navigation",
+                     {"body": body, "future": future, "command": command, "epoch": self._epoch}]
+            self._nav_tail = entry
+            heapq.heappush(self._queue, entry)
+            self._cond.notify()
+            return future
+
+    def emergency_stop(self):
+        """Queue an emergency stop ahead of everything else.
+
+        Navigation commands still waiting in the queue are dropped so the
+        robot does not start moving again right after stopping; the dispatch
+        thread resolves them to False as it reaches them.
+        """
+        future = Future()
+        with self._cond:
+            self._check_running()
+            self._epoch += 1
+            self._nav_tail = None
+            entry = [PRIORITY_EMERGENCY, next(self._seq), "/api/emergency_stop",
+                     {"body": None, "future": future, "command": None, "epoch": self._epoch}]
+            heapq.heappush(self._queue, entry)
+            self._cond.notify()
+        return future
+
+    def _check_running(self):
+        if not self._running:
+            raise RuntimeError("Command client is not running, call start() first")
+
+    def _dispatch_loop(self):
+        try:
+            self._connect()
+        except OSError:
+            # Connect lazily on the first command instead
+            self._disconnect()
+        try:
+            while True:
+                with self._cond:
+                    while self._running and not self._queue:
+                        self._cond.wait()
+                    if not self._queue:
+                        return
+                    _, _, path, item = heapq.heappop(self._queue)
+                    if self._nav_tail is not None and self._nav_tail[3] is item:
+                        self._nav_tail = None
+                    stale = item["epoch"] < self._epoch
+                    if stale:
+                        self.dropped_count += 1
+
+                if stale:
+                    _resolve(item["future"], False)
+                    continue
+                if not item["future"].set_running_or_notify_cancel():
+                    # Cancelled by the caller while queued
+                    continue
+                try:
+                    ok = self._post(path, item["body"], retry=item["command"] is None)
+                except Exception as e:
+                    print(f"❌ POST {path}: ERROR - {e}")
+                    ok = False
+                item["future"].set_result(ok)
+        finally:
+            self._disconnect()
+
+    def _post(self, path, body, retry=False):
+        """POST on the warm connection.
+
+        A connection idle longer than keepalive_idle is replaced before
+        sending. A failed send is only retried when retry is set (the
+        idempotent emergency stop): a dropped connection does not tell
+        whether the robot already acted on a navigation command.
+        """
+        payload = json.dumps(body).encode() if body is not None else b""
+        if self._conn is not None and time.perf_counter() - self._last_used > self.keepalive_idle:
+            self._disconnect()
+        reused = self._conn is not None
+        try:
+            return self._post_once(path, payload)
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            if not (retry and reused):
+                raise
+        return self._post_once(path, payload)
+
+    def _post_once(self, path, payload):
+        headers = {"Content-Type": "application/json", "Connection": "keep-alive"}
+        start = time.perf_counter()
+        try:
+            if self._conn is None:
+                self._connect()
+            self._conn.request("POST", path, body=payload, headers=headers)
+            response = self._conn.getresponse()
+            response.read()
+        except (http.client.HTTPException, OSError):
+            self._disconnect()
+            raise
+        self._last_used = time.perf_counter()
+        self.latencies.append(self._last_used - start)
+        if response.will_close:
+            self._disconnect()
+        return 200 <= response.status < 300
+
+    def latency_stats(self):
+        """Round-trip latency summary in milliseconds"""
+        samples = sorted(self.latencies)
+        if not samples:
+            return {"count": 0}
+
+        def pct(p):
+            return samples[min(len(samples) - 1, int(p / 100 * len(samples)))] * 1000
+
+        return {
+            "count": len(samples),
+            "min_ms": samples[0] * 1000,
+            "p50_ms": pct(50),
+            "p99_ms": pct(99),
+            "max_ms": samples[-1] * 1000,
+            "coalesced": self.coalesced_count,
+            "dropped": self.dropped_count,
+        }
+
+
+def _resolve(future, ok):
+    # Callers may have cancelled the future while it was queued
+    if future.set_running_or_notify_cancel():
+        future.set_result(ok)
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: python command_client.py <navigation_command|stop> [RPI_IP]")
+        return False
+
+    command = sys.argv[1]
+    host = sys.argv[2] if len(sys.argv) > 2 else RPI_IP
+
+    with RobotCommandClient(host) as client:
+        if command == "stop":
+            ok = client.emergency_stop().result()
+        else:
+            ok = client.send_navigation(command).result()
+
+        if ok:
+            print(f"✅ {command} sent to {host}")
+        else:
+            print(f"❌ {command} failed on {host}")
+        stats = client.latency_stats()
+        if stats["count"]:
+            print(f"⏱️  Round trip: {stats['p50_ms']:.1f} ms")
+    return ok
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,7 @@ Dynamic Raspberry Pi Discovery and Configuration
 Auto-discovers RPi on network and updates configuration dynamically
 """
 
+import ipaddress
 import socket
 import subprocess
 import threading
@@ -12,12 +13,25 @@ import json
 import requests
 from concurrent.futures import ThreadPoolExecutor
 import os
+from tracing import span, traced
+
+# Largest network scanned (/20 = 4094 hosts), each host costs a ping process
+MIN_SCAN_PREFIX = 20
 
 class RaspberryPiDiscovery:
-    def __init__(self):
+    def __init__(self, network=None, api_port=5000):
         self.potential_ips = []
         self.confirmed_rpi_ip = None
-        self.api_port = 5000
+        self.api_port = api_port
+        # CIDR to scan, e.g. "10.0.0.0/22"; None scans the local /24
+        if network is not None:
+            prefixlen = ipaddress.ip_network(network, strict=False).prefixlen
+            if prefixlen < MIN_SCAN_PREFIX:
+                raise ValueError(f"Network {network} is too large to scan, "
+                                 f"use /{MIN_SCAN_PREFIX} or smaller")
+        self.network = network
+        self.ping_workers = 50
+        self.api_workers = 20
         
     def get_local_network_range(self):
         """Get local network range"""
@@ -34,6 +48,18 @@ class RaspberryPiDiscovery:
         except Exception:
             return "192.168.1"  # Default fallback
     
+    def get_scan_targets(self):
+        """Get (network label, network base, host IPs) to scan"""
+        if self.network:
+            net = ipaddress.ip_network(self.network, strict=False)
+            hosts = [str(ip) for ip in net.hosts()]
+            network_base = '.'.join(str(net.network_address).split('.')[:-1])
+            return str(net), network_base, hosts
+        
+        network_base = self.get_local_network_range()
+        hosts = [f"{network_base}.{i}" for i in range(1, 255)]
+        return f"{network_base}.0/24", network_base, hosts
+    
     def ping_host(self, ip):
         """Check if host is reachable"""
         try:
@@ -59,20 +85,23 @@ class RaspberryPiDiscovery:
             pass
         return None
     
+    @traced("discover_raspberry_pi", category="discovery")
     def discover_raspberry_pi(self):
         """Discover Raspberry Pi with autonomy system"""
         print("🔍 Discovering Raspberry Pi on network...")
         
         # Get network range
-        network_base = self.get_local_network_range()
-        print(f"📡 Scanning network: {network_base}.1-254")
+        network, network_base, hosts = self.get_scan_targets()
+        print(f"📡 Scanning network: {network} ({len(hosts)} hosts)")
         
         # First, find reachable hosts
         reachable_hosts = []
-        with ThreadPoolExecutor(max_workers=50) as executor:
+        with span("ping_host batch", category="discovery", network=network,
+                  probes=len(hosts), workers=self.ping_workers) as batch, \
+                ThreadPoolExecutor(max_workers=self.ping_workers) as executor:
             futures = [
-                executor.submit(self.ping_host, f"{network_base}.{i}") 
-                for i in range(1, 255)
+                executor.submit(self.ping_host, ip) 
+                for ip in hosts
             ]
             
             for future in futures:
@@ -80,12 +109,15 @@ class RaspberryPiDiscovery:
                 if result:
                     reachable_hosts.append(result)
                     print(f"  📱 Found host: {result}")
+            batch.set("reachable", len(reachable_hosts))
         
         print(f"✅ Found {len(reachable_hosts)} reachable hosts")
         
         # Now check which ones have our API
         print("🔍 Checking for autonomy system API...")
-        with ThreadPoolExecutor(max_workers=20) as executor:
+        with span("check_rpi_api batch", category="discovery",
+                  probes=len(reachable_hosts), workers=self.api_workers) as batch, \
+                ThreadPoolExecutor(max_workers=self.api_workers) as executor:
             futures = [
                 executor.submit(self.check_rpi_api, ip) 
                 for ip in reachable_hosts
@@ -95,6 +127,7 @@ class RaspberryPiDiscovery:
                 result = future.result()
                 if result:
                     print(f"🎯 Found Raspberry Pi with autonomy system: {result}")
+                    batch.set("found", result)
                     self.confirmed_rpi_ip = result
                     return result
         
@@ -102,11 +135,13 @@ class RaspberryPiDiscovery:
         common_ips = [f"{network_base}.{i}" for i in [101, 102, 103, 104, 105, 150, 200]]
         print("🔄 Checking common Raspberry Pi IP addresses...")
         
-        for ip in common_ips:
-            if self.check_rpi_api(ip):
-                print(f"🎯 Found Raspberry Pi at common IP: {ip}")
-                self.confirmed_rpi_ip = ip
-                return ip
+        with span("check_rpi_api common IPs", category="discovery", probes=len(common_ips)) as batch:
+            for ip in common_ips:
+                if self.check_rpi_api(ip):
+                    print(f"🎯 Found Raspberry Pi at common IP: {ip}")
+                    batch.set("found", ip)
+                    self.confirmed_rpi_ip = ip
+                    return ip
         
         print("❌ Raspberry Pi with autonomy system not found")
         return None
@@ -214,7 +249,9 @@ def main():
         print(f"📁 Found existing config: {config['rpi_ip']}")
         
         # Test if it still works
-        if discovery.check_rpi_api(config['rpi_ip']):
+        with span("check_rpi_api cached IP", category="discovery", ip=config['rpi_ip']):
+            cached_ok = discovery.check_rpi_api(config['rpi_ip'])
+        if cached_ok:
             print(f"✅ Existing IP {config['rpi_ip']} still works!")
             discovery.confirmed_rpi_ip = config['rpi_ip']
         else:
@@ -10,6 +10,7 @@ import os
 import json
 import time
 from pathlib import Path
+from tracing import span, traced
 
 def run_command(command, shell=False):
     """Run a command and return the result."""
@@ -17,16 +18,20 @@ def run_command(command, shell=False):
         if isinstance(command, str) and not shell:
             command = command.split()
         
-        result = subprocess.run(
-            command, 
-            capture_output=True, 
-            text=True,
-            shell=shell
-        )
+        name = command if isinstance(command, str) else " ".join(command)
+        with span(name, category="command") as s:
+            result = subprocess.run(
+                command, 
+                capture_output=True, 
+                text=True,
+                shell=shell
+            )
+            s.set("returncode", result.returncode)
         return result.returncode == 0, result.stdout, result.stderr
     except Exception as e:
         return False, "", str(e)
 
+@traced(category="step")
 def check_prerequisites():
     """Check if all prerequisites are available."""
     print("🔍 Checking prerequisites...")
@@ -61,6 +66,7 @@ def check_prerequisites():
     
     return True
 
+@traced(category="step")
 def install_dependencies():
     """Install npm dependencies."""
     print("\n📦 Installing dependencies...")
@@ -71,6 +77,7 @@ def install_dependencies():
     print("✅ Dependencies installed successfully")
     return True
 
+@traced(category="step")
 def discover_rpi():
     """Run RPi discovery."""
     print("\n🔍 Discovering Raspberry Pi...")
@@ -81,6 +88,7 @@ def discover_rpi():
     print("✅ Raspberry Pi discovered and configured")
     return True
 
+@traced(category="step")
 def build_frontend():
     """Build the frontend."""
     print("\n🏗️ Building frontend...")
@@ -91,6 +99,7 @@ def build_frontend():
     print("✅ Frontend built successfully")
     return True
 
+@traced(category="step")
 def deploy_to_github():
     """Deploy to GitHub Pages."""
     print("\n🚀 Deploying to GitHub Pages...")
@@ -101,6 +110,7 @@ def deploy_to_github():
     print("✅ Deployed to GitHub Pages successfully")
     return True
 
+@traced(category="step")
 def deploy_to_rpi():
     """Deploy to Raspberry Pi."""
     print("\n🤖 Deploying to Raspberry Pi...")
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Simple web server to serve the frontend on Raspberry Pi
+Exposes per-route request counts, bytes sent and latency histograms at /metrics
+"""
+
+import http.server
+import socketserver
+import os
+import sys
+import time
+from array import array
+from bisect import bisect_left
+
+# Histogram upper bounds in seconds (+Inf bucket is implicit)
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+MAX_ROUTES = 128
+OVERFLOW_ROUTE = "other"
+# Non-2xx/3xx responses share one slot so 404s from scanners and typos
+# cannot use up the route table
+ERROR_ROUTE = "error"
+
+
+class RouteMetrics:
+    """Fixed-size per-route counters stored in flat preallocated arrays.
+
+    Routes get a slot the first time they are seen; once MAX_ROUTES slots are
+    taken, new paths are counted under OVERFLOW_ROUTE. Failed requests are
+    recorded under ERROR_ROUTE by the handler. Recording a request only
+    updates array cells in place. Not thread-safe: TCPServer handles one
+    request at a time.
+    """
+
+    def __init__(self, max_routes=MAX_ROUTES, buckets=LATENCY_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.max_routes = max_routes
+        self._stride = len(self.buckets) + 1
+        self._routes = {OVERFLOW_ROUTE: 0, ERROR_ROUTE: 1}
+        self._names = [OVERFLOW_ROUTE, ERROR_ROUTE]
+        self.requests = array('Q', [0] * max_routes)
+        self.bytes_sent = array('Q', [0] * max_routes)
+        self.latency_sum = array('d', [0.0] * max_routes)
+        self.latency_buckets = array('Q', [0] * (max_routes * self._stride))
+
+    def _slot(self, route):
+        slot = self._routes.get(route)
+        if slot is None:
+            if len(self._names) >= self.max_routes:
+                return 0
+            slot = len(self._names)
+            self._routes[route] = slot
+            self._names.append(route)
+        return slot
+
+    def record(self, route, nbytes, seconds):
+        slot = self._slot(route)
+        self.requests[slot] += 1
+        self.bytes_sent[slot] += nbytes
+        self.latency_sum[slot] += seconds
+        self.latency_buckets[slot * self._stride + bisect_left(self.buckets, seconds)] += 1
+
+    def render(self):
+        """Render all counters in Prometheus text exposition format"""
+        labels = [(slot, '{route="%s"' % _escape_label(name)) for slot, name in enumerate(self._names)]
+        lines = [
+            "# HELP web_requests_total Requests handled per route.",
+            "# TYPE web_requests_total counter",
+        ]
+        lines += [f"web_requests_total{label}}} {self.requests[slot]}" for slot, label in labels]
+        lines += [
+            "# HELP web_response_bytes_total Response bytes sent per route, headers included.",
+            "# TYPE web_response_bytes_total counter",
+        ]
+        lines += [f"web_response_bytes_total{label}}} {self.bytes_sent[slot]}" for slot, label in labels]
+        lines += [
+            "# HELP web_request_duration_seconds Time spent handling a request.",
+            "# TYPE web_request_duration_seconds histogram",
+        ]
+        bounds = [repr(b) for b in self.buckets] + ["+Inf"]
+        for slot, label in labels:
+            base = slot * self._stride
+            cumulative = 0
+            for i, bound in enumerate(bounds):
+                cumulative += self.latency_buckets[base + i]
+                lines.append(f'web_request_duration_seconds_bucket{label},le="{bound}"}} {cumulative}')
+            lines.append(f"web_request_duration_seconds_sum{label}}} {self.latency_sum[slot]}")
+            lines.append(f"web_request_duration_seconds_count{label}}} {self.requests[slot]}")
+        return "\n".join(lines) + "\n"
+
+
+class _CountingWriter:
+    """Wraps the handler's wfile and counts the bytes written to it"""
+    __slots__ = ("_out", "count")
+
+    def __init__(self, out):
+        self._out = out
+        self.count = 0
+
+    def write(self, data):
+        self.count += len(data)
+        return self._out.write(data)
+
+    def __getattr__(self, name):
+        return getattr(self._out, name)
+
+
+def _escape_label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class CustomHTTPRequestHandler(http.server.SimpleHTTPRequestHandler):
+    serve_directory = "web/dist"
+    # Set to None to serve without instrumentation
+    metrics = RouteMetrics()
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=self.serve_directory, **kwargs)
+
+    def end_headers(self):
+        # Add CORS headers
+        self.send_header('Access-Control-Allow-Origin', '*')
+        self.send_header('Access-Control-Allow-Methods', 'GET, POST, OPTIONS')
+        self.send_header('Access-Control-Allow-Headers', 'Content-Type')
+        super().end_headers()
+
+    def send_response(self, code, message=None):
+        if self.metrics is not None:
+            self._status = code
+        super().send_response(code, message)
+
+    def flush_headers(self):
+        if self.metrics is not None and hasattr(self, '_headers_buffer'):
+            self._bytes_sent += sum(map(len, self._headers_buffer))
+        super().flush_headers()
+
+    def copyfile(self, source, outputfile):
+        super().copyfile(source, outputfile)
+        if self.metrics is not None:
+            self._bytes_sent += source.tell()
+
+    def send_error(self, code, message=None, explain=None):
+        if self.metrics is None:
+            return super().send_error(code, message, explain)
+        # Rare path: count everything send_error writes, headers included
+        sent = self._bytes_sent
+        wfile = self.wfile = _CountingWriter(self.wfile)
+        try:
+            super().send_error(code, message, explain)
+        finally:
+            self.wfile = wfile._out
+            self._bytes_sent = sent + wfile.count
+
+    def handle_one_request(self):
+        if self.metrics is None:
+            return super().handle_one_request()
+
+        # Only set once a request line has been parsed successfully
+        self.command = None
+        self._status = 0
+        self._bytes_sent = 0
+        start = time.perf_counter()
+        super().handle_one_request()
+        if not self._status:
+            # Connection closed before a request line arrived
+            return
+        if self.command is not None and 200 <= self._status < 400:
+            path = self.path
+            if '?' in path:
+                path = path.split('?', 1)[0]
+        else:
+            path = ERROR_ROUTE
+        self.metrics.record(path, self._bytes_sent, time.perf_counter() - start)
+
+    def do_GET(self):
+        if self.metrics is not None and self.path.partition('?')[0] == '/metrics':
+            body = self.metrics.render().encode()
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            self._bytes_sent += len(body)
+            return
+        super().do_GET()
+
+
+def main():
+    port = 8080
+
+    # Change to autonomy_system directory
+    os.chdir(os.path.expanduser("~/autonomy_system"))
+
+    if not os.path.exists("web/dist"):
+        print("❌ Frontend not found. Deploy first with deployment script.")
+        sys.exit(1)
+
+    print(f"🌐 Starting web server on port {port}")
+    print(f"📁 Serving from: {os.getcwd()}/web/dist")
+    print(f"🔗 Access at: http://localhost:{port}")
+    print(f"📊 Metrics at: http://localhost:{port}/metrics")
+
+    with socketserver.TCPServer(("", port), CustomHTTPRequestHandler) as httpd:
+        print(f"✅ Server running...")
+        try:
+            httpd.serve_forever()
+        except KeyboardInterrupt:
+            print("\n🛑 Server stopped")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Lightweight Tracing for the setup scripts
+Records timed spans and writes them as a Chrome trace (open in Perfetto or
+chrome://tracing). Enable by setting DRISHTI_TRACE to an output path:
+
+    DRISHTI_TRACE=setup_trace.json python quick_setup.py
+
+Child scripts started with the variable set write their spans to a
+per-pid part file next to it; the top-level script merges the parts when it
+exits, so children may also run in parallel. Spans from children still
+running after the top-level script exits are not included. When disabled,
+span() returns a shared no-op.
+"""
+
+import atexit
+import functools
+import glob
+import inspect
+import json
+import os
+import sys
+import threading
+import time
+
+TRACE_ENV = "DRISHTI_TRACE"
+ROOT_ENV = "DRISHTI_TRACE_ROOT_PID"
+
+# perf_counter is precise but per-process, shift it onto the wall clock so
+# spans from different scripts line up in one trace
+_CLOCK_OFFSET = time.time() - time.perf_counter()
+
+_trace_path = None
+_events = []
+
+
+def _now_us():
+    return (time.perf_counter() + _CLOCK_OFFSET) * 1e6
+
+
+class Span:
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name, category, args):
+        self.name = name
+        self.category = category
+        self.args = args
+
+    def set(self, key, value):
+        """Attach an attribute to the span"""
+        self.args[key] = value
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = _now_us()
+        if exc_type is not None:
+            self.args["error"] = f"{exc_type.__name__}: {exc}"
+        _events.append({
+            "name": self.name,
+            "cat": self.category,
+            "ph": "X",
+            "ts": self.start,
+            "dur": end - self.start,
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+            "args": self.args,
+        })
+        return False
+
+
+class _NoopSpan:
+    __slots__ = ()
+
+    def set(self, key, value):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+def span(name, category="setup", **attrs):
+    """Time a block: `with span("npm install", command=cmd) as s: ...`"""
+    if _trace_path is None:
+        return _NOOP_SPAN
+    return Span(name, category, attrs)
+
+
+def traced(name=None, category="setup", record=()):
+    """Decorator wrapping every call of a function in a span.
+
+    The return value is attached as the "result" attribute, and the
+    arguments named in record (e.g. record=("rpi_ip",)) as attributes of
+    the same name.
+    """
+    def decorator(func):
+        span_name = name or func.__name__
+        signature = inspect.signature(func) if record else None
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _trace_path is None:
+                return func(*args, **kwargs)
+            attrs = {}
+            if signature is not None:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                attrs = {key: bound.arguments[key] for key in record}
+            with Span(span_name, category, attrs) as s:
+                result = func(*args, **kwargs)
+                s.set("result", _attr_value(result))
+                return result
+        return wrapper
+    return decorator
+
+
+def _attr_value(value):
+    # Trace args must be JSON, keep scalars and summarise anything else
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    return type(value).__name__
+
+
+def enabled():
+    return _trace_path is not None
+
+
+def enable(path):
+    """Start recording spans, written to path when the process exits"""
+    global _trace_path
+    if _trace_path is not None:
+        return
+    _trace_path = os.path.abspath(path)
+    os.environ[TRACE_ENV] = _trace_path
+
+    if ROOT_ENV not in os.environ:
+        # Top-level script: start a fresh trace, children add part files
+        os.environ[ROOT_ENV] = str(os.getpid())
+        if os.path.exists(_trace_path):
+            os.remove(_trace_path)
+        for stale in _part_files():
+            os.remove(stale)
+
+    _events.append({
+        "name": "process_name",
+        "ph": "M",
+        "pid": os.getpid(),
+        "tid": 0,
+        "args": {"name": os.path.basename(sys.argv[0]) or "python"},
+    })
+    atexit.register(write)
+
+
+def _part_files():
+    return glob.glob(glob.escape(_trace_path) + ".*.part")
+
+
+def write():
+    """Write this process's spans; the top-level script merges all parts"""
+    if _trace_path is None or not _events:
+        return
+    events = list(_events)
+    _events.clear()
+
+    if os.environ.get(ROOT_ENV) != str(os.getpid()):
+        with open(f"{_trace_path}.{os.getpid()}.part", 'w') as f:
+            json.dump(events, f)
+        return
+
+    for part in _part_files():
+        try:
+            with open(part, 'r') as f:
+                events.extend(json.load(f))
+        except ValueError:
+            print(f"⚠️ Skipping unreadable trace part {part}")
+        os.remove(part)
+
+    with open(_trace_path, 'w') as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+    print(f"📈 Trace written to {_trace_path} (open in https://ui.perfetto.dev)")
+
+
+if os.environ.get(TRACE_ENV):
+    enable(os.environ[TRACE_ENV])